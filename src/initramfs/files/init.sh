@@ -20,8 +20,12 @@ mount -t proc -o nodev,noexec,nosuid proc /proc
 echo "/sbin/mdev" > /proc/sys/kernel/hotplug
 mdev -s
 
+# read the kernel command line once with the shell builtin instead of forking
+# cat for every option lookup
+read -r kernel_cmdline < /proc/cmdline
+
 get_option() {
-    value=" $(cat /proc/cmdline) "
+    value=" ${kernel_cmdline} "
     value="${value##* ${1}=}"
     value="${value%% *}"
     [ "${value}" != "" ] && echo "${value}"
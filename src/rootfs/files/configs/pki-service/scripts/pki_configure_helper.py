@@ -10,6 +10,11 @@ from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
 SWARM_KEY_FILE = "/etc/swarm/swarm.key"
 SWARM_CPU_TYPE_FILE = "/etc/swarm/swarm-cpu-type"
 SWARM_NETWORK_TYPE_FILE = "/etc/swarm/swarm-network-type"
@@ -17,11 +22,11 @@ SERVICE_NAME = "pki-configure-helper"
 SYNC_CLIENT_PORT = 9443
 
 
-class LiteralBlockDumper(yaml.SafeDumper):
+class LiteralBlockDumper(SafeDumper):
     """Render multi-line strings using YAML literal block style."""
 
 
-def _represent_multiline_str(dumper: yaml.SafeDumper, data: str):
+def _represent_multiline_str(dumper: SafeDumper, data: str):
     style = "|" if "\n" in data else None
     return dumper.represent_scalar("tag:yaml.org,2002:str", data, style=style)
 
@@ -47,11 +52,10 @@ def read_first_line(path: Path) -> str | None:
     if not path.exists():
         return None
 
-    lines = path.read_text(encoding="utf-8").splitlines()
-    if not lines:
-        return None
+    with path.open(encoding="utf-8") as file:
+        first_line = file.readline()
 
-    return lines[0].strip() or None
+    return first_line.strip() or None
 
 
 def detect_network_type() -> str:
@@ -267,7 +271,7 @@ def run_get_vm_mode(config_path: Path, output_path: Path) -> int:
         return 255
 
     try:
-        config_data = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+        config_data = yaml.load(config_path.read_text(encoding="utf-8"), Loader=SafeLoader) or {}
         if not isinstance(config_data, dict):
             raise ValueError("Invalid config: root must be a mapping")
 
@@ -289,7 +293,7 @@ def run_configure(template_path: Path, output_path: Path):
     try:
         generate_swarm_key()
         log("INFO", f"Loading template from {template_path}")
-        template_data = yaml.safe_load(template_path.read_text(encoding="utf-8"))
+        template_data = yaml.load(template_path.read_text(encoding="utf-8"), Loader=SafeLoader)
         if not isinstance(template_data, dict):
             raise ValueError("Invalid template: root must be a mapping")
 
@@ -318,7 +322,7 @@ def run_configure_sync_client(config_path: Path, output_path: Path) -> int:
 
     try:
         log("INFO", f"Loading swarm config from {config_path}")
-        config_data = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+        config_data = yaml.load(config_path.read_text(encoding="utf-8"), Loader=SafeLoader) or {}
         rendered_data = build_sync_client_pki_authority(config_data)
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -2,59 +2,66 @@
 
 set -euo pipefail;
 
-# Set default policy to DROP for INPUT
+# Set default policy to DROP for INPUT.
+# This runs on its own before the batch below, so a failing batch still leaves the VM closed.
 iptables -P INPUT DROP
 
+SWARM_NETWORK_TYPE_FILE="/etc/swarm/swarm-network-type"
+SWARM_NETWORK_TYPE="$(head -n1 "$SWARM_NETWORK_TYPE_FILE" 2>/dev/null | tr -d '[:space:]' || true)"
+
+# All filter rules are collected into one iptables-restore batch, so they are
+# installed atomically with a single xtables lock instead of one iptables call per rule.
+# --noflush keeps rules added by other services (rke2, podman) intact.
+RULES="*filter
+
 # Allow established and related connections
-iptables -A INPUT -m state --state ESTABLISHED,RELATED -j ACCEPT
+-A INPUT -m state --state ESTABLISHED,RELATED -j ACCEPT
 
 # Allow all traffic on the loopback interface
-iptables -A INPUT -i lo -j ACCEPT
-iptables -A OUTPUT -o lo -j ACCEPT
+-A INPUT -i lo -j ACCEPT
+-A OUTPUT -o lo -j ACCEPT
 
 # Allow DNS requests
-iptables -A INPUT -p udp --dport 53 -j ACCEPT
-iptables -A INPUT -p udp --sport 53 -j ACCEPT
+-A INPUT -p udp --dport 53 -j ACCEPT
+-A INPUT -p udp --sport 53 -j ACCEPT
 
 # Allow HTTPS (TCP 443)
-iptables -A INPUT -p tcp --dport 443 -j ACCEPT
+-A INPUT -p tcp --dport 443 -j ACCEPT
 
 # Allow HTTP (TCP 80)
-iptables -A INPUT -p tcp --dport 80 -j ACCEPT
+-A INPUT -p tcp --dport 80 -j ACCEPT
 
 # Allow HTTPS for PKI service
-iptables -A INPUT -p tcp --dport 9443 -j ACCEPT
+-A INPUT -p tcp --dport 9443 -j ACCEPT
 
 # Allow PKI VM measurements service
-iptables -A INPUT -p tcp --dport 9180 -j ACCEPT
+-A INPUT -p tcp --dport 9180 -j ACCEPT
 
 # Allow incoming traffic in the cluster network
 # @TODO this will ignore NetworkPolicies in k8s, refactor in future
-iptables -I INPUT -s 10.43.0.0/16 -j ACCEPT
-iptables -I INPUT -s 10.42.0.0/16 -j ACCEPT
-iptables -I INPUT -s 10.13.0.0/16 -j ACCEPT
+-I INPUT -s 10.43.0.0/16 -j ACCEPT
+-I INPUT -s 10.42.0.0/16 -j ACCEPT
+-I INPUT -s 10.13.0.0/16 -j ACCEPT
 
 # Allow podman bridge networks to reach host services (Ubuntu 24.04 podman: 10.88/16)
 # Required for containers using bridge networking (e.g. harbor) to access
 # host services bound to WireGuard interface
-iptables -I INPUT -s 10.88.0.0/16 -j ACCEPT
-iptables -I INPUT -s 10.89.0.0/16 -j ACCEPT
+-I INPUT -s 10.88.0.0/16 -j ACCEPT
+-I INPUT -s 10.89.0.0/16 -j ACCEPT
 
 # Allow WireGuard (UDP 51820)
-iptables -A INPUT -p udp --dport 51820 -j ACCEPT
+-A INPUT -p udp --dport 51820 -j ACCEPT
 
 # Allow swarm-db gossip (TCP/UDP 7946)
-iptables -A INPUT -p tcp --dport 7946 -j ACCEPT
-iptables -A INPUT -p udp --dport 7946 -j ACCEPT
-
-SWARM_NETWORK_TYPE_FILE="/etc/swarm/swarm-network-type"
-SWARM_NETWORK_TYPE="$(head -n1 "$SWARM_NETWORK_TYPE_FILE" 2>/dev/null | tr -d '[:space:]' || true)"
+-A INPUT -p tcp --dport 7946 -j ACCEPT
+-A INPUT -p udp --dport 7946 -j ACCEPT
+"
 
 case "$SWARM_NETWORK_TYPE" in
     untrusted)
         # Allow SSH (TCP 22)
-        iptables -A INPUT -p tcp --dport 22 -j ACCEPT
-        systemctl start ssh
+        RULES+="-A INPUT -p tcp --dport 22 -j ACCEPT
+"
         ;;
     trusted)
         ;;
@@ -62,3 +69,12 @@ case "$SWARM_NETWORK_TYPE" in
         echo "Unsupported or missing swarm network type '$SWARM_NETWORK_TYPE'; keeping SSH disabled" >&2
         ;;
 esac
+
+RULES+="COMMIT
+"
+
+iptables-restore --noflush <<< "$RULES"
+
+if [ "$SWARM_NETWORK_TYPE" = "untrusted" ]; then
+    systemctl start ssh
+fi
@@ -11,14 +11,13 @@ fi
 mysql_host="${DB_HOST:-127.0.0.1}"
 mysql_port="${DB_PORT:-3306}"
 wait_timeout="${DB_WAIT_TIMEOUT_SECONDS:-60}"
-start_ts="$(date +%s)"
+start_ts=$SECONDS
 while true; do
   if (exec 3<>/dev/tcp/"$mysql_host"/"$mysql_port") 2>/dev/null; then
     exec 3>&- 3<&-
     break
   fi
-  now_ts="$(date +%s)"
-  elapsed=$(( now_ts - start_ts ))
+  elapsed=$(( SECONDS - start_ts ))
   if [ "$elapsed" -ge "$wait_timeout" ]; then
     break
   fi